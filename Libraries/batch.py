@@ -0,0 +1,114 @@
+# By Zhufyak V.V
+# zhufyakvv@gmail.com
+# github.com/zhufyakvv
+# Runs many programs on one level at once. Same rules as Libraries/simulate
+import numpy
+
+from Libraries.decode import Block, parse
+from Libraries.simulate import Field, steps
+
+# Opcodes of simple commands, 0 is end of program
+halt = 0
+opcodes = {"forward": 1, "back": 2, "left": 3, "right": 4}
+step_x = numpy.array([i[0] for i in steps], dtype=numpy.int64)
+step_y = numpy.array([i[1] for i in steps], dtype=numpy.int64)
+
+
+def assemble(programs):
+    """
+    Decodes programs and pads them into opcode matrix
+    :param programs: list of "Dirty" programs (list of strings) or Blocks
+    :return: numpy matrix N x longest program, filled with halt after end
+    """
+    decoded = []
+    for i in programs:
+        block = i if isinstance(i, Block) else parse(i)
+        decoded.append([opcodes[j] for j in block if j in opcodes])
+    longest = max([len(i) for i in decoded] + [0])
+    codes = numpy.full((len(decoded), longest), halt, dtype=numpy.int8)
+    for i in range(len(decoded)):
+        codes[i, :len(decoded[i])] = decoded[i]
+    return codes
+
+
+class Grid:
+    """
+    Occupancy of level cells as numpy arrays
+    """
+
+    def __init__(self, field):
+        """
+        :param field: Field
+        """
+        cells = list(field.ground) + [field.placement]
+        self.x = min(i[0] for i in cells)
+        self.y = min(i[1] for i in cells)
+        w = max(i[0] for i in cells) - self.x + 1
+        h = max(i[1] for i in cells) - self.y + 1
+        self.ground = numpy.zeros((w, h), dtype=bool)
+        self.finish = numpy.zeros((w, h), dtype=bool)
+        for i in field.ground:
+            self.ground[i[0] - self.x, i[1] - self.y] = True
+        for i in field.finish:
+            self.finish[i[0] - self.x, i[1] - self.y] = True
+
+    def look(self, layer, x, y):
+        """
+        Looks up cells in some layer, cells out of grid are empty
+        :param layer: ground or finish array
+        :param x: numpy array of x cells
+        :param y: numpy array of y cells
+        :return: numpy array of bool
+        """
+        x = x - self.x
+        y = y - self.y
+        inside = (x >= 0) & (x < layer.shape[0]) & (y >= 0) & (y < layer.shape[1])
+        result = numpy.zeros(x.shape, dtype=bool)
+        result[inside] = layer[x[inside], y[inside]]
+        return result
+
+
+class Outcomes:
+    """
+    Results of many programs, numpy vectors by program
+    """
+
+    def __init__(self, n, placement, direction):
+        self.success = numpy.zeros(n, dtype=bool)
+        self.fall = numpy.zeros(n, dtype=bool)
+        self.steps = numpy.zeros(n, dtype=numpy.int64)
+        self.x = numpy.full(n, placement[0], dtype=numpy.int64)
+        self.y = numpy.full(n, placement[1], dtype=numpy.int64)
+        self.direction = numpy.full(n, direction, dtype=numpy.int64)
+
+
+def evaluate(lvl, codes):
+    """
+    Runs all programs in lockstep, one command of every program per turn
+    :param lvl: level class or Field
+    :param codes: opcode matrix from assemble()
+    :return: Outcomes
+    """
+    field = lvl if isinstance(lvl, Field) else Field(lvl)
+    grid = Grid(field)
+    outcomes = Outcomes(codes.shape[0], field.placement, field.direction)
+    if not field.stand(field.placement):
+        outcomes.fall[:] = True
+        return outcomes
+
+    for i in range(codes.shape[1]):
+        code = codes[:, i]
+        active = (code != halt) & ~outcomes.fall
+        if not active.any():
+            break
+        outcomes.steps += active
+        move = (code == opcodes["forward"]).astype(numpy.int64) - (code == opcodes["back"])
+        move *= active
+        outcomes.x += step_x[outcomes.direction] * move
+        outcomes.y += step_y[outcomes.direction] * move
+        turn = (code == opcodes["right"]).astype(numpy.int64) - (code == opcodes["left"])
+        outcomes.direction = (outcomes.direction + turn * active) % 4
+        outcomes.fall |= (move != 0) & ~grid.look(grid.ground, outcomes.x, outcomes.y)
+
+    outcomes.success = ~outcomes.fall & grid.look(grid.finish, outcomes.x, outcomes.y)
+    return outcomes
@@ -3,6 +3,151 @@
 # github.com/zhufyakvv
 # 24.02.2017
 
+loop_start = "lo"
+loop_end = "op"
+loop_repeat = 2
+
+turn_left = "left"
+turn_right = "right"
+
+
+class Block:
+    """
+    Compiled part of program. Body is list of simple commands and nested blocks,
+    whole body runs repeat times:
+    LO LEFT BACK OP => Block([Block([LEFT, BACK], 2)], 1)
+    """
+
+    def __init__(self, body=None, repeat=1):
+        """
+        :param body: list of strings and blocks
+        :param repeat: how many times body runs
+        """
+        self.body = []
+        self.repeat = repeat
+        # Simple commands in one run of body
+        self.size = 0
+        # Direction change in one run of body
+        self.turn = 0
+        for i in body if body is not None else []:
+            self.append(i)
+
+    def append(self, item):
+        """
+        Adds command or block to the end of body
+        :param item: string or Block
+        :return:
+        """
+        self.body.append(item)
+        if isinstance(item, Block):
+            self.size += len(item)
+            self.turn += item.rotation()
+        else:
+            self.size += 1
+            if item == turn_right:
+                self.turn += 1
+            elif item == turn_left:
+                self.turn -= 1
+
+    def rotation(self):
+        """
+        :return: Direction change after whole block
+        """
+        return self.repeat * self.turn
+
+    def __len__(self):
+        """
+        :return: Amount of simple commands in decoded block
+        """
+        return self.repeat * self.size
+
+    def __iter__(self):
+        """
+        Walks through block without decoding it into list
+        :return: simple commands one by one
+        """
+        stack = [[self, 0, self.repeat]]
+        while len(stack) > 0:
+            frame = stack[-1]
+            if frame[1] == len(frame[0].body):
+                # End of body, run it again or leave block
+                frame[1] = 0
+                frame[2] -= 1
+                if frame[2] <= 0:
+                    stack.pop()
+                continue
+            item = frame[0].body[frame[1]]
+            frame[1] += 1
+            if isinstance(item, Block):
+                stack.append([item, 0, item.repeat])
+            else:
+                yield item
+
+    def expand(self):
+        """
+        :return: list of simple commands
+        """
+        return list(self)
+
+
+def parse(program):
+    """
+    Parses program into tree of blocks in one pass.
+    Not closed LO is closed at the end of program,
+    not opened OP loops everything from the beginning of program.
+    :param program: list of string
+    :return: Block
+    """
+    stack = [Block()]
+    for i in program:
+        if i == loop_start:
+            stack.append(Block(repeat=loop_repeat))
+        elif i == loop_end:
+            if len(stack) > 1:
+                loop = stack.pop()
+                stack[-1].append(loop)
+            else:
+                stack[0].repeat = loop_repeat
+                stack[0] = Block([stack[0]])
+        else:
+            stack[-1].append(i)
+    while len(stack) > 1:
+        loop = stack.pop()
+        stack[-1].append(loop)
+    return stack[0]
+
+
+def turn_step(turns, command):
+    """
+    Direction change of program part, as parse() sees it, after one more command
+    :param turns: tuple of direction changes of whole part and of every not closed loop
+    :param command: string
+    :return: new tuple
+    """
+    if command == loop_start:
+        return turns + (0,)
+    elif command == loop_end:
+        if len(turns) > 1:
+            return turns[:-2] + (turns[-2] + loop_repeat * turns[-1],)
+        return (loop_repeat * turns[0],)
+    elif command == turn_right:
+        return turns[:-1] + (turns[-1] + 1,)
+    elif command == turn_left:
+        return turns[:-1] + (turns[-1] - 1,)
+    return turns
+
+
+def turn_total(turns):
+    """
+    Direction change of program part, with not closed loops closed at the end
+    :param turns: tuple from turn_step()
+    :return: int
+    """
+    result = 0
+    for i in reversed(turns):
+        result = i + loop_repeat * result
+    return result
+
 
 def decode(program):
     """
@@ -11,35 +156,4 @@ def decode(program):
     :param program: list of string
     :return:
     """
-    result = []
-    i = 0
-    while i < len(program):
-        if program[i] == "lo":
-            lo = 1
-            j = i + 1
-            while lo > 0:
-                if j == len(program):
-                    program.append("op")
-
-                if program[j] == "lo":
-                    lo += 1
-                elif program[j] == "op":
-                    lo -= 1
-
-                j += 1 if lo > 0 else 0
-            if i + 1 == j - 1:
-                tmp = [program[i + 1]]
-            else:
-                tmp = program[i + 1:j]
-            del program[j]
-            del program[i]
-            program[i:i] = tmp
-            i -= 1
-        elif program[i] == "op":
-            program[0:0] = ["lo"]
-            i = 0
-            result = []
-        else:
-            result.append(program[i])
-        i += 1
-    return result
+    return parse(program).expand()
@@ -1,28 +1,217 @@
 import os
+from collections import OrderedDict
 from os.path import isfile, join, isdir
 
 import pygame
 
 import variables
 
+cache_size = 128
+text_cache_size = 256
+# Images of these folders are packed into atlas sheets
+atlas_folders = ("Source/", "Source/Menu/", "Source/Tiles/", "Source/Prop/")
+atlas_size = (1024, 1024)
+atlas_expansion = ".png"
+
+
+class Cache:
+    """
+    Process wide cache of loaded assets.
+    Assets are shared, so nobody draws on them. Least recently used are evicted
+    """
+
+    def __init__(self, size=cache_size):
+        self.size = size
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        :param key: path and conversion flags
+        :return: cached asset, None if there is no one
+        """
+        if key in self.items:
+            self.hits += 1
+            self.items.move_to_end(key)
+            return self.items[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """
+        Caches asset
+        :param key: path and conversion flags
+        :param value: asset
+        :return: asset
+        """
+        self.items[key] = value
+        self.items.move_to_end(key)
+        while len(self.items) > self.size:
+            self.items.popitem(last=False)
+        return value
+
+    def pop(self, key):
+        """
+        Forgets asset
+        :param key: path and conversion flags
+        :return: asset, None if there was no one
+        """
+        return self.items.pop(key, None)
+
+    def clear(self):
+        self.items.clear()
+
+
+cache = Cache()
+# Rendered texts, apart from images so they do not push images out
+texts = Cache(text_cache_size)
+
+
+class Rotations:
+    """
+    Pre-rotated copies of image, clock like
+    """
+
+    def __init__(self, original, steps=variables.rotation_steps):
+        """
+        :param original: pygame.Surface
+        :param steps: angles in every quarter turn, 1 for only four directions
+        """
+        self.original = original
+        self.steps = steps
+        self.images = [pygame.transform.rotate(original, -90 * i / steps) for i in range(4 * steps)]
+
+    def get(self, direction):
+        """
+        :param direction: float, 1 = 90 degrees clock like
+        :return: nearest pre-rotated image
+        """
+        return self.images[int(round(direction * self.steps)) % len(self.images)]
+
+
+class Atlas:
+    """
+    Images packed into few big sheets, row by row in order they are asked for.
+    Every image is a subsurface of its sheet
+    """
+
+    def __init__(self, folders=atlas_folders, sheet_size=atlas_size):
+        """
+        :param folders: folders with images
+        :param sheet_size: size of one sheet, bigger images are not packed
+        """
+        self.folders = folders
+        self.sheet_size = sheet_size
+        self.sheets = []
+        # Image name -> (sheet index, pygame.Rect)
+        self.index = {}
+        # Place for next image on last sheet and height of current row
+        self.x, self.y, self.row = 0, 0, 0
+
+    def packs(self, name):
+        """
+        :param name: path to image
+        :return: Bool, image belongs to atlas
+        """
+        return name[:name.rfind("/") + 1] in self.folders and name.endswith(atlas_expansion)
+
+    def add(self, name):
+        """
+        Loads image and packs it, needs display mode to be set
+        :param name: path to image
+        :return: Bool, image was packed
+        """
+        try:
+            current = pygame.image.load(name).convert_alpha()
+        except pygame.error:
+            return False
+        w, h = current.get_size()
+        if w > self.sheet_size[0] or h > self.sheet_size[1]:
+            return False
+        if self.x + w > self.sheet_size[0]:
+            self.x, self.y, self.row = 0, self.y + self.row, 0
+        if len(self.sheets) == 0 or self.y + h > self.sheet_size[1]:
+            sheet = pygame.Surface(self.sheet_size, pygame.SRCALPHA).convert_alpha()
+            sheet.fill((0, 0, 0, 0))
+            self.sheets.append(sheet)
+            self.x, self.y, self.row = 0, 0, 0
+        # Copies pixels as they are, without alpha blending
+        self.sheets[-1].blit(current, (self.x, self.y), special_flags=pygame.BLEND_RGBA_MAX)
+        self.index[name] = (len(self.sheets) - 1, pygame.Rect(self.x, self.y, w, h))
+        self.x += w
+        self.row = max(self.row, h)
+        return True
+
+    def get(self, name):
+        """
+        :param name: path to image
+        :return: new subsurface of sheet, None if image is not packed
+        """
+        if name not in self.index and (not self.packs(name) or not self.add(name)):
+            return None
+        sheet, rect = self.index[name]
+        return self.sheets[sheet].subsurface(rect)
+
+
+atlas = Atlas()
+
+
+def rotated(original, direction):
+    """
+    Rotates image without rotating it every time
+    :param original: pygame.Surface, loaded image
+    :param direction: float, 1 = 90 degrees clock like
+    :return: rotated pygame.Surface, shared
+    """
+    key = ("rotations", id(original))
+    rotations = cache.get(key)
+    # Kept original is checked, id can be reused after eviction
+    if rotations is None or rotations.original is not original:
+        rotations = cache.put(key, Rotations(original))
+    return rotations.get(direction)
+
 
 def image(name, color_key=None):
-    fullname = os.path.join('', name)
-    try:
-        current = pygame.image.load(fullname)
-    except pygame.error:
-        print('Cannot load image:', name)
-        current = pygame.surface.Surface((50, 50))
-        current.fill((255, 0, 0))
+    key = ("image", name, color_key)
+    current = cache.get(key)
+    if current is not None:
         return current, current.get_rect()
-    current = current.convert_alpha()
+    current = atlas.get(name)
+    if current is None:
+        fullname = os.path.join('', name)
+        try:
+            current = pygame.image.load(fullname)
+        except pygame.error:
+            print('Cannot load image:', name)
+            current = pygame.surface.Surface((50, 50))
+            current.fill((255, 0, 0))
+            return current, current.get_rect()
+        current = current.convert_alpha()
     if color_key is not None:
-        if color_key is -1:
+        if color_key == -1:
             color_key = current.get_at((0, 0))
         current.set_colorkey(color_key, pygame.RLEACCEL)
+    cache.put(key, current)
     return current, current.get_rect()
 
 
+def text(font, string, color, antialias=True):
+    """
+    Renders text once for same font, string and color
+    :param font: pygame.font.Font
+    :param string: text
+    :param color: tuple
+    :param antialias: bool
+    :return: pygame.Surface, shared
+    """
+    key = (font, string, tuple(color), bool(antialias))
+    current = texts.get(key)
+    if current is None:
+        current = texts.put(key, font.render(string, antialias, color))
+    return current
+
+
 def load_lined_sprite(filename, w, h):
     images = []
     parent_image = pygame.image.load(os.path.join('src', filename)).convert_alpha()
@@ -37,8 +226,14 @@ def load_lined_sprite(filename, w, h):
 
 
 def load_sliced_sprite(filename, w, h):
+    key = ("sliced", filename, w, h)
+    images = cache.get(key)
+    if images is not None:
+        return list(images)
     images = []
-    parent_image = pygame.image.load(filename).convert_alpha()
+    parent_image = atlas.get(filename)
+    if parent_image is None:
+        parent_image = pygame.image.load(filename).convert_alpha()
 
     parent_image.set_colorkey((255, 0, 255))
     parent_w, parent_h = parent_image.get_size()
@@ -46,7 +241,8 @@ def load_sliced_sprite(filename, w, h):
     for j in range(int(parent_h / h)):
         for i in range(int(parent_w / w)):
             images.append(parent_image.subsurface((i * w, j * h, w, h)))
-    return images
+    cache.put(key, images)
+    return list(images)
 
 
 def sound(name):
@@ -55,12 +251,16 @@ def sound(name):
 
     if not pygame.mixer:
         return NoneSound()
+    key = ("sound", name)
+    current_sound = cache.get(key)
+    if current_sound is not None:
+        return current_sound
     fullname = name
     try:
         current_sound = pygame.mixer.Sound(fullname)
     except pygame.error:
         print('Cannot load sound:', name)
-    return current_sound
+    return cache.put(key, current_sound)
 
 
 def get_levels(path=variables.level_path):
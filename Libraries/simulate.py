@@ -0,0 +1,255 @@
+# By Zhufyak V.V
+# zhufyakvv@gmail.com
+# github.com/zhufyakvv
+# Game rules on grid cells. Has no pygame inside, so runs without display
+from Libraries.decode import Block, parse
+
+tile = (50, 50)
+finish = "finish"
+# Direction - clock like
+# 0 - top
+# 1 - right
+# 2 - bot
+# 3 - left
+steps = ((0, -1), (1, 0), (0, 1), (-1, 0))
+moves = {"forward": 1, "back": -1}
+turns = {"right": 1, "left": -1}
+# Bigger loops are not checked at once, but command by command
+footprint_limit = 4096
+
+
+def rotate(cell, direction):
+    """
+    Rotates cell around (0, 0) clock like
+    :param cell: tuple (x, y)
+    :param direction: 0<=direction<=3
+    :return: rotated cell
+    """
+    x, y = cell
+    if direction == 1:
+        return -y, x
+    elif direction == 2:
+        return -x, -y
+    elif direction == 3:
+        return y, -x
+    return x, y
+
+
+class Field:
+    """
+    Level on grid cells
+    """
+
+    def __init__(self, lvl=None):
+        # Cells robot can stand on
+        self.ground = set()
+        # Cells with finish
+        self.finish = set()
+        # Robot start
+        self.placement = (0, 0)
+        self.direction = 0
+        if lvl is not None:
+            self.level(lvl)
+
+    def level(self, lvl):
+        """
+        Loads tiles and robot from level
+        :param lvl: level class
+        :return:
+        """
+        for i in lvl.tiles:
+            cell = (i.place[0] // tile[0], i.place[1] // tile[1])
+            self.ground.add(cell)
+            if i.type == finish:
+                self.finish.add(cell)
+        self.placement = tuple(lvl.placement)
+        self.direction = lvl.direction
+
+    def stand(self, cell):
+        """
+        :param cell: tuple (x, y)
+        :return: Bool, robot can stand on cell
+        """
+        return cell in self.ground
+
+
+class Summary:
+    """
+    Net effect of block on robot, related to robot that stands on (0, 0) and looks to top
+    """
+
+    def __init__(self, block, memo):
+        """
+        :param block: Block
+        :param memo: dict of already summarized inner blocks
+        """
+        # Robot pose after one run of body
+        x, y, direction = 0, 0, 0
+        cells = set()
+        for i in block.body:
+            if isinstance(i, Block):
+                inner = memo[id(i)]
+                if cells is not None and inner.cells is not None:
+                    cells.update(self.place(inner.cells, (x, y), direction))
+                else:
+                    cells = None
+                shift = rotate(inner.shift, direction)
+                x, y = x + shift[0], y + shift[1]
+                direction = (direction + inner.turn) % 4
+            elif i in moves:
+                shift = rotate(steps[0], direction)
+                x, y = x + shift[0] * moves[i], y + shift[1] * moves[i]
+                if cells is not None:
+                    cells.add((x, y))
+            elif i in turns:
+                direction = (direction + turns[i]) % 4
+            if cells is not None and len(cells) > footprint_limit:
+                cells = None
+
+        # Whole block is body repeated
+        self.shift = (0, 0)
+        self.turn = 0
+        self.cells = set() if cells is not None else None
+        for i in range(block.repeat):
+            if self.cells is not None:
+                self.cells.update(self.place(cells, self.shift, self.turn))
+                if len(self.cells) > footprint_limit:
+                    self.cells = None
+            shift = rotate((x, y), self.turn)
+            self.shift = (self.shift[0] + shift[0], self.shift[1] + shift[1])
+            self.turn = (self.turn + direction) % 4
+
+    @staticmethod
+    def place(cells, position, direction):
+        """
+        Moves related cells to robot pose
+        :param cells: iterable of (x, y)
+        :param position: robot cell
+        :param direction: robot direction
+        :return: list of cells
+        """
+        result = []
+        for i in cells:
+            cell = rotate(i, direction)
+            result.append((position[0] + cell[0], position[1] + cell[1]))
+        return result
+
+
+def summarize(block, memo):
+    """
+    Summarizes block and all inner blocks, each only once
+    :param block: Block
+    :param memo: dict id(block) -> Summary
+    :return: Summary of block
+    """
+    stack = [block]
+    while len(stack) > 0:
+        top = stack[-1]
+        inner = [i for i in top.body if isinstance(i, Block) and id(i) not in memo]
+        if len(inner) > 0:
+            stack.extend(inner)
+            continue
+        stack.pop()
+        memo[id(top)] = Summary(top, memo)
+    return memo[id(block)]
+
+
+class Outcome:
+    """
+    Result of program run
+    """
+
+    def __init__(self, placement=(0, 0), direction=0, trace=False):
+        # Program succeeded
+        self.success = False
+        # Cell where robot fell, None if did not
+        self.fall = None
+        # Simple commands done
+        self.steps = 0
+        # Last simple command done one by one
+        self.command = None
+        # Robot pose
+        self.position = tuple(placement)
+        self.direction = direction
+        # Robot poses after every simple command, if traced
+        self.trajectory = [(self.position, self.direction)] if trace else None
+
+    def run(self, command, field):
+        """
+        Does one simple command
+        :param command: string
+        :param field: Field
+        :return: Bool, robot still stands
+        """
+        self.steps += 1
+        self.command = command
+        if command in moves:
+            shift = steps[self.direction]
+            self.position = (self.position[0] + shift[0] * moves[command],
+                             self.position[1] + shift[1] * moves[command])
+            if not field.stand(self.position):
+                self.fall = self.position
+        elif command in turns:
+            self.direction = (self.direction + turns[command]) % 4
+        if self.trajectory is not None:
+            self.trajectory.append((self.position, self.direction))
+        return self.fall is None
+
+    def jump(self, block, summary, field):
+        """
+        Does whole block at once, if robot stands all the way
+        :param block: Block
+        :param summary: Summary of block
+        :param field: Field
+        :return: Bool, block was done
+        """
+        if summary.cells is None or len(summary.cells) > len(field.ground):
+            return False
+        for i in Summary.place(summary.cells, self.position, self.direction):
+            if not field.stand(i):
+                return False
+        shift = rotate(summary.shift, self.direction)
+        self.position = (self.position[0] + shift[0], self.position[1] + shift[1])
+        self.direction = (self.direction + summary.turn) % 4
+        self.steps += len(block)
+        return True
+
+
+def simulate(lvl, program, fast=True, trace=False):
+    """
+    Runs program on level without drawing.
+    Loops, where robot stands all the way, are done at once
+    :param lvl: level class or Field
+    :param program: list of strings - "Dirty" program, or Block
+    :param fast: jump over whole loops
+    :param trace: keep every robot pose, loops are not jumped then
+    :return: Outcome
+    """
+    field = lvl if isinstance(lvl, Field) else Field(lvl)
+    block = program if isinstance(program, Block) else parse(program)
+    outcome = Outcome(field.placement, field.direction, trace)
+    fast = fast and not trace
+    if not field.stand(outcome.position):
+        outcome.fall = outcome.position
+        return outcome
+
+    memo = {}
+    stack = [[block, 0, block.repeat]]
+    while len(stack) > 0:
+        frame = stack[-1]
+        if frame[1] == len(frame[0].body):
+            frame[1] = 0
+            frame[2] -= 1
+            if frame[2] <= 0:
+                stack.pop()
+            continue
+        item = frame[0].body[frame[1]]
+        frame[1] += 1
+        if isinstance(item, Block):
+            if not fast or not outcome.jump(item, summarize(item, memo), field):
+                stack.append([item, 0, item.repeat])
+        elif not outcome.run(item, field):
+            return outcome
+
+    outcome.success = outcome.position in field.finish
+    return outcome
@@ -0,0 +1,278 @@
+# By Zhufyak V.V
+# zhufyakvv@gmail.com
+# github.com/zhufyakvv
+# Finds shortest program that passes level under its commands budget
+import time
+
+from Libraries.decode import loop_end, loop_start
+from Libraries.simulate import Field, moves, rotate, simulate, steps, turns
+
+commands = ("forward", "back", "left", "right", loop_start, loop_end)
+# Search gives up after so many expanded states
+state_limit = 2000000
+
+
+class Solution:
+    """
+    Found program and search statistics
+    """
+
+    def __init__(self):
+        # Shortest program, None if level can't be passed
+        self.program = None
+        # States of search that were expanded
+        self.expanded = 0
+        # Search time in seconds
+        self.time = 0.0
+        # Search stopped at state limit, so no program does not mean level can't be passed
+        self.limited = False
+
+    def __len__(self):
+        """
+        :return: Length of found program
+        """
+        return len(self.program) if self.program is not None else 0
+
+
+class State:
+    """
+    Program prefix, as much as future commands need to know about it.
+    Loops are kept as summaries (cells, x, y, direction) related to the start of loop
+    """
+
+    def __init__(self, pose, budget, loops, root, moved, parent=None, command=None):
+        """
+        :param pose: absolute robot (x, y, direction)
+        :param budget: tuple of commands left, same order as commands
+        :param loops: tuple of summaries of not closed loops
+        :param root: summary of whole prefix
+        :param moved: Bool, prefix has some simple command
+        :param parent: State before last command
+        :param command: last command
+        """
+        self.pose = pose
+        self.budget = budget
+        self.loops = loops
+        self.root = root
+        self.moved = moved
+        self.parent = parent
+        self.command = command
+
+    def key(self):
+        """
+        :return: What future of prefix depends on, except budget
+        """
+        # Whole prefix is looped only by OP, that has no LO to close
+        root = self.root if self.budget[commands.index(loop_end)] > len(self.loops) else None
+        return self.pose, self.loops, root, self.moved
+
+    def program(self):
+        """
+        :return: list of strings - "Dirty" program of prefix
+        """
+        result = []
+        state = self
+        while state.parent is not None:
+            result.append(state.command)
+            state = state.parent
+        result.reverse()
+        return result
+
+
+def extend(summary, body):
+    """
+    Appends body summary to the end of other summary
+    :param summary: (cells, x, y, direction)
+    :param body: (cells, x, y, direction)
+    :return: new summary
+    """
+    cells, x, y, direction = summary
+    cells = cells.union(place(body[0], (x, y, direction)))
+    shift = rotate(body[1:3], direction)
+    return cells, x + shift[0], y + shift[1], (direction + body[3]) % 4
+
+
+def place(cells, pose):
+    """
+    Moves related cells to pose
+    :param cells: iterable of (x, y)
+    :param pose: (x, y, direction)
+    :return: list of cells
+    """
+    result = []
+    for i in cells:
+        cell = rotate(i, pose[2])
+        result.append((pose[0] + cell[0], pose[1] + cell[1]))
+    return result
+
+
+def repeat(field, pose, body):
+    """
+    Runs body of loop once again
+    :param field: Field
+    :param pose: absolute robot pose
+    :param body: summary of loop body
+    :return: new pose, None if robot falls
+    """
+    for i in place(body[0], pose):
+        if not field.stand(i):
+            return None
+    shift = rotate(body[1:3], pose[2])
+    return pose[0] + shift[0], pose[1] + shift[1], (pose[2] + body[3]) % 4
+
+
+class Solver:
+    """
+    Breadth first search over programs, shortest first
+    """
+
+    def __init__(self, lvl, limit=state_limit):
+        """
+        :param lvl: level class
+        :param limit: max amount of expanded states, None for no limit
+        """
+        self.limit = limit
+        self.field = Field(lvl)
+        self.budget = tuple(int(lvl.moves.get(i, 0)) for i in commands)
+        # Pareto front of budgets for every seen key
+        self.seen = {}
+
+    def dominated(self, state):
+        """
+        Checks if same state with more commands left was already seen,
+        remembers state otherwise
+        :param state: State
+        :return: Bool
+        """
+        front = self.seen.setdefault(state.key(), [])
+        for i in front:
+            if all(i[j] >= state.budget[j] for j in range(len(commands))):
+                return True
+        front[:] = [i for i in front if not all(state.budget[j] >= i[j] for j in range(len(commands)))]
+        front.append(state.budget)
+        return False
+
+    def follow(self, state, command):
+        """
+        Appends command to prefix
+        :param state: State
+        :param command: string
+        :return: new State, None if robot falls or command can't be used
+        """
+        index = commands.index(command)
+        if state.budget[index] <= 0:
+            return None
+        budget = state.budget[:index] + (state.budget[index] - 1,) + state.budget[index + 1:]
+        pose, loops, root = state.pose, state.loops, state.root
+
+        if command == loop_start:
+            loops = loops + ((frozenset(), 0, 0, 0),)
+        elif command == loop_end:
+            if len(loops) > 0:
+                pose, loops, root = self.close(pose, loops, root)
+            else:
+                # Loop from the beginning of program
+                pose = repeat(self.field, pose, root)
+                root = extend(root, root)
+            if pose is None:
+                return None
+        else:
+            pose, loops, root = self.run(pose, loops, root, command)
+            if pose is None:
+                return None
+        return State(pose, budget, loops, root, state.moved or command not in (loop_start, loop_end), state,
+                     command)
+
+    def run(self, pose, loops, root, command):
+        """
+        Does simple command
+        :return: pose, loops, root after command, pose is None if robot falls
+        """
+        if command in moves:
+            shift = steps[pose[2]]
+            pose = (pose[0] + shift[0] * moves[command], pose[1] + shift[1] * moves[command], pose[2])
+            if not self.field.stand(pose[:2]):
+                return None, loops, root
+            body = (frozenset([(0, -moves[command])]), 0, -moves[command], 0)
+        else:
+            pose = (pose[0], pose[1], (pose[2] + turns[command]) % 4)
+            body = (frozenset(), 0, 0, turns[command] % 4)
+        loops = tuple(extend(i, body) for i in loops)
+        return pose, loops, extend(root, body)
+
+    def close(self, pose, loops, root):
+        """
+        Closes innermost loop, its body runs once again
+        :return: pose, loops, root after loop, pose is None if robot falls
+        """
+        body = loops[-1]
+        pose = repeat(self.field, pose, body)
+        loops = tuple(extend(i, body) for i in loops[:-1])
+        return pose, loops, extend(root, body)
+
+    def finish(self, state):
+        """
+        Checks if prefix passes level, when it is whole program
+        :param state: State
+        :return: Bool
+        """
+        if not state.moved:
+            return False
+        pose, loops, root = state.pose, state.loops, state.root
+        while len(loops) > 0:
+            pose, loops, root = self.close(pose, loops, root)
+            if pose is None:
+                return False
+        return pose[:2] in self.field.finish
+
+    def solve(self):
+        """
+        Searches for shortest program
+        :return: Solution
+        """
+        solution = Solution()
+        start = time.time()
+        placement = self.field.placement
+        if self.field.stand(placement):
+            empty = (frozenset(), 0, 0, 0)
+            layer = [State((placement[0], placement[1], self.field.direction), self.budget, (), empty, False)]
+            self.dominated(layer[0])
+        else:
+            layer = []
+
+        while len(layer) > 0 and solution.program is None:
+            following = []
+            for state in layer:
+                if self.limit is not None and solution.expanded >= self.limit:
+                    solution.limited = True
+                    break
+                solution.expanded += 1
+                for command in commands:
+                    current = self.follow(state, command)
+                    if current is None or self.dominated(current):
+                        continue
+                    if self.finish(current):
+                        solution.program = current.program()
+                        break
+                    following.append(current)
+                if solution.program is not None:
+                    break
+            if solution.limited:
+                break
+            layer = following
+
+        solution.time = time.time() - start
+        return solution
+
+
+def solve(lvl, limit=state_limit):
+    """
+    Finds shortest program for level
+    :param lvl: level class
+    :param limit: max amount of expanded states, None for no limit
+    :return: Solution
+    """
+    solution = Solver(lvl, limit).solve()
+    if solution.program is not None and not simulate(lvl, solution.program).success:
+        raise RuntimeError("Solver and simulation disagree on " + str(solution.program))
+    return solution
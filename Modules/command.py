@@ -44,16 +44,16 @@ class Command(Sprite):
         :return:
         """
         surf = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        surf.blit(pygame.transform.rotate(self.original, self.direction * -90), (0, 0))
+        surf.blit(rotated(self.original, self.direction), (0, 0))
         if self.countable:
             if self.hover:
-                text = self.big_font.render(str(self.amount), 2, (0, 0, 0))
-                text_size = self.big_font.size(str(self.amount))
-                surf.blit(text, ((self.rect.width - text_size[0]) / 2, (self.rect.height - text_size[1]) / 2))
+                rendered = text(self.big_font, str(self.amount), (0, 0, 0))
+                text_size = rendered.get_size()
+                surf.blit(rendered, ((self.rect.width - text_size[0]) / 2, (self.rect.height - text_size[1]) / 2))
             else:
-                text = self.font.render(str(self.amount), 2, (0, 0, 0))
-                text_size = self.font.size(str(self.amount))
-                surf.blit(text, (self.rect.width - text_size[0], 0))
+                rendered = text(self.font, str(self.amount), (0, 0, 0))
+                text_size = rendered.get_size()
+                surf.blit(rendered, (self.rect.width - text_size[0], 0))
         self.image = surf
 
     def delta_direction(self, delta):
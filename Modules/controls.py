@@ -64,16 +64,14 @@ class Controls(surface.Surface):
         Directing forward and back commands fro comfortable view
         :return:
         """
-        self.forward.direction = self.current_direction
-        self.back.direction = self.current_direction
-        self.left.direction = self.current_direction
-        self.right.direction = self.current_direction
-
-        self.left.update()
-        self.right.update()
-        self.forward.update()
-        self.back.update()
-        self.update()
+        changed = False
+        for i in (self.forward, self.back, self.left, self.right):
+            if i.direction != self.current_direction:
+                i.direction = self.current_direction
+                i.update()
+                changed = True
+        if changed:
+            self.invalidate()
 
     def set_delta_direct(self, delta):
         """
@@ -94,11 +92,14 @@ class Controls(surface.Surface):
         :param item: sprite with name of addable command
         :return:
         """
+        changed = False
         for i in self.group:
             for j in item:
                 if j.name == i.name:
                     i.change_amount(1)
-        self.update()
+                    changed = True
+        if changed:
+            self.invalidate()
 
     def set(self, name, amount):
         """
@@ -110,7 +111,7 @@ class Controls(surface.Surface):
         for i in self.group:
             if name == str(i):
                 i.set_amount(int(amount))
-        self.update()
+        self.invalidate()
 
     def level(self, lvl):
         """
@@ -79,9 +79,9 @@ class OptionText(sprite.Sprite):
         surf = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
         if self.flick:
             surf.fill(sec_color)
-        size = self.font.size(self.caption)
+        text = load.text(self.font, self.caption, (0, 0, 0))
+        size = text.get_size()
         place = ((self.rect.w - size[0]) / 2, (self.rect.h - size[1]) / 2)
-        text = self.font.render(self.caption, 2, (0, 0, 0))
         surf.blit(text, place)
         self.image = surf
 
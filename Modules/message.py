@@ -13,7 +13,36 @@ color = (200, 200, 200)
 sec_color = (106, 106, 106)
 text_color = (0, 0, 0)
 text_pos = (10, 20)
-line_length_limit = variables.message_line_length
+# Text is wrapped before page controls
+text_width = size[0] - command.width - 2 * text_pos[0]
+
+
+def wrap(font, text, width):
+    """
+    Splits text into lines, that fit width in font
+    :param font: pygame.font.Font
+    :param text: string
+    :param width: max line width in pixels
+    :return: list of strings
+    """
+    lines = []
+    line = ""
+    for word in text.split(" "):
+        candidate = word if line == "" else line + " " + word
+        if font.size(candidate)[0] <= width:
+            line = candidate
+            continue
+        if line != "":
+            lines.append(line)
+        # Word longer than line is broken by letters
+        line = ""
+        for letter in word:
+            if line != "" and font.size(line + letter)[0] > width:
+                lines.append(line)
+                line = ""
+            line += letter
+    lines.append(line)
+    return lines
 
 
 class MessageText(sprite.Sprite):
@@ -22,23 +51,16 @@ class MessageText(sprite.Sprite):
         self.text_pos = t_p
         self.font = variables.font_message_text
         self.text = text
+        # Text wrapped once, by real width of letters
+        self.lines = wrap(self.font, text, text_width)
         self.update()
 
     def update(self):
         surf = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        current = text_pos
-        text = self.text
-        while len(text) > line_length_limit:
-            index = text.rfind(" ", 0, line_length_limit)
-            index = line_length_limit if index < 0 else index
-            line = text[:index]
-            text = text[index + 1:]
-            text_size = self.font.size(line)
-            text_rend = self.font.render(line, 2, text_color)
-            surf.blit(text_rend, current)
-            current = (current[0], current[1] + text_size[1])
-        text_rend = self.font.render(text, 2, text_color)
-        surf.blit(text_rend, current)
+        line_height = self.font.get_height()
+        surf.blits([(self.font.render(self.lines[i], 2, text_color),
+                     (self.text_pos[0], self.text_pos[1] + i * line_height)) for i in range(len(self.lines))],
+                   doreturn=False)
         self.image = surf
 
 
@@ -46,12 +68,18 @@ class Message(surface.Surface):
     def __init__(self, pos=position, s=size, c=color):
         pygame.Surface.__init__(self, s)
         self.text = []
+        # Rendered pages of text
+        self.pages = []
         self.page = 0
         self.rect = pygame.Rect(pos[0], pos[1], s[0], s[1])
         self.group = pygame.sprite.Group()
         self.set_position(pos)
         self.color = c
         self.echo = None
+        self.mouse = None
+        self.hover = None
+        self.dirty = None
+        self.invalid = False
 
         self.page_next = Command("next_page", (size[0] - command.width, command.height))
         self.page_next.uncountable()
@@ -65,10 +93,11 @@ class Message(surface.Surface):
         self.fill(self.color)
         self.group.empty()
         self.group.add(self.page_next)
-        if self.page < len(self.text):
-            self.group.add(MessageText(self.text[self.page]))
+        if self.page < len(self.pages):
+            self.group.add(self.pages[self.page])
         pygame.draw.rect(self, sec_color, (size[0] - command.width, 0, size[0], size[1]))
-        self.group.draw(self)
+        self.blits([(i.image, i.rect) for i in self.group], doreturn=False)
+        self.touch()
 
     def make(self):
         """
@@ -84,15 +113,16 @@ class Message(surface.Surface):
                     self.echo = None
                     if self.page >= len(self.text):
                         echo = "end"
-        self.echo = echo
+        self.echo = echo if len(echo) > 0 else None
 
     def set_text(self, text):
         """
-        Sets text for message
+        Sets text for message, lays out and renders its pages
         :param text: list of strings
         :return: 
         """
         self.text = text
+        self.pages = [MessageText(i) for i in text]
 
     def flush(self):
         """
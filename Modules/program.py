@@ -1,7 +1,8 @@
 import pygame
 
 import variables
-from Libraries.decode import decode
+from Libraries import load
+from Libraries.decode import parse, turn_step, turn_total
 from Modules import command
 from Modules import surface
 from Modules.command import Command
@@ -12,6 +13,8 @@ text_color = (0, 0, 0)
 color = (200, 200, 200)
 sec_color = (106, 106, 106)
 commands = 10
+# Rendered pages kept
+pages_cached = 16
 
 
 class Program(surface.Surface):
@@ -23,6 +26,10 @@ class Program(surface.Surface):
         self.color = c
         self.font = variables.font_heavy
         self.echo = None
+        self.mouse = None
+        self.hover = None
+        self.dirty = None
+        self.invalid = False
         # End of special needs
         self.direction = 0
 
@@ -30,9 +37,13 @@ class Program(surface.Surface):
         self.page_next = Command("next_page", (size[0] - command.width, command.height))
         self.listing_counter = None
         self.program = []
+        # Direction changes for every prefix of program, see turn_step()
+        self.turns = [(0,)]
         self.page = 0
         self.max_page = 0
         self.delete_array = False
+        # Rendered commands of pages
+        self.pages = load.Cache(pages_cached)
 
         self.page_next.uncountable()
         self.page_prev.uncountable()
@@ -46,13 +57,16 @@ class Program(surface.Surface):
         Draw everything
         :return:
         """
+        self.listing_update()
         self.group_up()
         self.fill(self.color)
         pygame.draw.rect(self, sec_color, (0, 0, command.width, size[1]))
         pygame.draw.rect(self, sec_color, (size[0] - command.width, 0, size[0], size[1]))
-        self.group.draw(self)
-        self.listing_update()
-        self.blit(self.listing_counter, (size[0] / 2, size[1] - 25))
+        self.blits(((self.page_prev.image, self.page_prev.rect),
+                    (self.page_next.image, self.page_next.rect),
+                    (self.get_page(), (0, 0)),
+                    (self.listing_counter, (size[0] / 2, size[1] - 25))), doreturn=False)
+        self.touch()
 
     def listing_update(self):
         """
@@ -64,8 +78,8 @@ class Program(surface.Surface):
             self.page = 0
         if self.page > self.max_page:
             self.page = self.max_page
-        self.listing_counter = self.font.render("" + str(self.page + 1) + "/" + str(self.max_page + 1) + "", 2,
-                                                text_color)
+        self.listing_counter = load.text(self.font, "" + str(self.page + 1) + "/" + str(self.max_page + 1) + "",
+                                         text_color)
 
     def group_up(self):
         """
@@ -77,12 +91,32 @@ class Program(surface.Surface):
         self.group.add(self.page_prev)
 
         place = 0
-        for i in range(0, len(self.program)):
-            if self.page * commands <= i < (self.page + 1) * commands:
-                place += command.width
-                self.program[i].set_placement((place, command.width))
-                self.program[i].update()
-                self.group.add(self.program[i])
+        for i in self.program[self.page * commands:(self.page + 1) * commands]:
+            place += command.width
+            i.set_placement((place, command.width))
+            self.group.add(i)
+
+    def get_page(self):
+        """
+        Commands of current page, rendered once while page is not changed
+        :return: pygame.Surface
+        """
+        strip = self.pages.get(self.page)
+        if strip is None:
+            strip = pygame.Surface(self.get_size(), pygame.SRCALPHA)
+            for i in self.program[self.page * commands:(self.page + 1) * commands]:
+                strip.blit(i.image, i.rect)
+            self.pages.put(self.page, strip)
+        return strip
+
+    def pages_out(self, index=0):
+        """
+        Forgets rendered pages with command index and after it
+        :param index: index of first changed command
+        :return:
+        """
+        for i in [i for i in self.pages.items if i >= index // commands]:
+            self.pages.pop(i)
 
     def make(self):
         """
@@ -94,10 +128,10 @@ class Program(surface.Surface):
             for i in self.echo:
                 if i == self.page_prev:
                     self.page -= 1
-                    self.echo = None
+                    self.invalidate()
                 elif i == self.page_next:
                     self.page += 1
-                    self.echo = None
+                    self.invalidate()
                 else:
                     # Delete clicked item
                     echo.append(i)
@@ -111,7 +145,8 @@ class Program(surface.Surface):
                         for j in range(0, len(self.program) - int(index) + 1):
                             echo.append(self.program[len(self.program) - 1])
                             self.delete(len(self.program) - 1)
-        self.echo = echo
+        # Nothing is echoed, when nothing was deleted
+        self.echo = echo if len(echo) > 0 else None
 
     def add(self, items):
         """
@@ -120,14 +155,17 @@ class Program(surface.Surface):
         :return:
         """
         if items is not None:
+            self.pages_out(len(self.program))
             for i in items:
                 tmp = i.copy()
                 tmp.uncountable()
+                tmp.update()
                 self.program.append(tmp)
+                self.turns.append(turn_step(self.turns[-1], str(tmp)))
                 # If page full get next
                 if len(self.program) % commands == 1:
                     self.page += 1
-                self.update()
+            self.update()
 
     def delete(self, index):
         """
@@ -137,43 +175,51 @@ class Program(surface.Surface):
         """
         tmp = self.program[index]
         self.program.pop(index)
+        self.turns_up(index)
+        self.pages_out(index)
 
-        # Turn all in program when turn deleted
-        if len(self.program) > 0 and (str(tmp) == "left" or str(tmp) == "right"):
-            for i in range(0, len(self.program)):
+        # Turn all after it in program when turn or loop deleted
+        if str(tmp) != "forward" and str(tmp) != "back":
+            for i in range(index, len(self.program)):
                 if str(self.program[i]) == "forward" or str(self.program[i]) == "back":
                     self.program[i].set_direction(self.direction + self.get_delta_direction(0, i))
                 else:
                     self.program[i].set_direction(0)
+                self.program[i].update()
 
-    def get_program(self, start=0, end=None):
+    def turns_up(self, start=0):
         """
-        Gets program
-        :return: list of sprites
+        Recounts direction changes of prefixes, that end after start
+        :param start: index of first changed command
+        :return:
+        """
+        del self.turns[start + 1:]
+        for i in range(start, len(self.program)):
+            self.turns.append(turn_step(self.turns[i], str(self.program[i])))
+
+    def get_commands(self, start=0, end=None):
+        """
+        Gets "dirty" program, with LO and OP
+        :return: list of strings
         """
         if end is None:
             end = len(self.program)
-        tmp = []
-        for i in self.program[start:end]:
-            tmp.append(str(i))
+        return [str(i) for i in self.program[start:end]]
 
-        tmp = decode(tmp)
-        return tmp
+    def get_program(self, start=0, end=None):
+        """
+        Gets program
+        :return: list of sprites
+        """
+        return parse(self.get_commands(start, end)).expand()
 
     def get_delta_direction(self, start=0, end=None):
         """
         Decodes program and returns direction change from the beginning
         """
-        if end is None:
-            end = len(self.program)
-
-        direction = 0
-        for i in self.get_program(start, end):
-            if str(i) == "right":
-                direction += 1
-            elif str(i) == "left":
-                direction -= 1
-        return direction
+        if start == 0:
+            return turn_total(self.turns[len(self.program) if end is None else end])
+        return parse(self.get_commands(start, end)).rotation()
 
     def flush(self):
         """
@@ -182,4 +228,6 @@ class Program(surface.Surface):
         """
         self.group.empty()
         self.program.clear()
+        self.turns_up()
+        self.pages_out()
         self.update()
@@ -36,8 +36,6 @@ class Robot(sprite.Sprite):
         self.death_sound = load.sound(def_location + sound_explosion)
         self.death_sound.set_volume(sound_volume)
         self.original = self.image
-        self.fx = float(self.rect.x)
-        self.fy = float(self.rect.y)
         self.direction = 2
 
     def flush(self):
@@ -45,59 +43,13 @@ class Robot(sprite.Sprite):
         self.death_sprite_current = 0.0
         self.update()
 
-    def turn(self, value):
-        """
-        Turns robot on degree
-        :param value: float 0<=float<=3 1 = 90 ; value = 2 == Pi
-        :return:
-        """
-        self.direction = float(self.direction) + float(value)
-        self.turn_normalize()
-
-    def turn_normalize(self):
-        if self.direction < 0:
-            self.direction += 4
-        elif self.direction >= 4:
-            self.direction -= 4
-
-    def turn_left(self):
-        """
-        Turns robot left
-        :return:
-        """
-        self.direction -= 1
-        self.turn_normalize()
-
-    def turn_right(self):
-        """
-        Turns robot right
-        :return:
-        """
-        self.direction += 1
-        self.turn_normalize()
-
-    def move(self, percent):
-        """
-        Moving robot on float value
-        :param percent: -1 <= percent <= 1 of one step
-        :return:
-        """
-
-        self.direction = int(round(self.direction))
-        if int(round(self.direction)) % 2 == 0:
-            self.fy += (1 if self.direction == 2 else -1) * height * percent
-            self.rect.y = int(self.fy)
-        else:
-            self.fx += (1 if self.direction == 1 else -1) * width * percent
-            self.rect.x = int(self.fx)
-
     def update(self):
         """
         Rotate image if needed
         :return:
         """
         if not self.dead:
-            self.image = pygame.transform.rotate(self.original, self.direction * -90)
+            self.image = load.rotated(self.original, self.direction)
             # To rotate around center
             self.rect = self.image.get_rect(center=self.rect.center)
         sprite.Sprite.update(self)
@@ -110,35 +62,26 @@ class Robot(sprite.Sprite):
         """
         self.rect.x = cell[0] * width
         self.rect.y = cell[1] * height
-        self.fx = self.rect.x
-        self.fy = self.rect.y
 
-    def direct(self, direction):
+    def show(self, cell, direction):
         """
-        Turns robot to some direction
-        :param direction: 0<=direction<=3
+        Shows robot on cell, can be between cells while moving
+        :param cell: tuple (x, y), float
+        :param direction: float 0<=direction<4
         :return:
         """
-        self.direction = direction
+        self.direction = direction % 4
+        self.rect.center = (int(round(cell[0] * width)) + width // 2, int(round(cell[1] * height)) + height // 2)
         self.update()
 
-    def tile_collide(self, group):
+    def direct(self, direction):
         """
-        Checks robot collision to tile
-        Actually its just collision to the center of sprite
-        :param group:
+        Turns robot to some direction
+        :param direction: 0<=direction<=3
         :return:
         """
-        result = []
-        point = (self.rect[0] + self.rect[2] / 2, self.rect[1] + self.rect[3] / 2)
-        for i in group:
-            if i.collision(point):
-                result.append(i)
-
-        if len(result) == 0:
-            return False, None
-        else:
-            return True, result
+        self.direction = direction
+        self.update()
 
     def death(self, percent=1.0):
         """
@@ -2,7 +2,10 @@ import pygame
 
 import variables
 from Libraries import load
+from Libraries.decode import Block, parse
+from Libraries.simulate import Field, Outcome, moves, simulate, steps, turns
 from Modules import surface
+from Modules import tile
 from Modules.robot import Robot
 from Modules.tile import Tile
 
@@ -11,7 +14,12 @@ size = (variables.screen_resolution[0], 0.75 * variables.screen_resolution[1])
 color = [14, 14, 14]
 
 speed_up = 5
+# One command lasts time, simulation goes by fixed sub-steps of step_time
 time = 1000
+step_time = 10
+substeps = time // step_time
+# Commands done at once every frame in turbo mode, only last of them is shown
+turbo_commands = 50
 
 background_music = "Sounds/background.wav"
 background_music_volume = 0.15
@@ -25,13 +33,27 @@ def_location = "Source/"
 class Scene(surface.Surface):
     def __init__(self, pos=position, s=size, c=color):
         self.robot = Robot()
+        # Background with all tiles, they do not change while running
+        self.layer = None
         surface.Surface.__init__(self, pos, s, c)
         # Background music
         self.background_music = load.sound(def_location + background_music)
         self.background_music.play(-1)
         self.background_music.set_volume(background_music_volume)
-        # Scene program from engine
-        self.program = []
+        # Scene program from engine, compiled
+        self.program = Block()
+        # Stream of simple commands from program and current one
+        self.commands = iter(self.program)
+        self.command = None
+        # Tile sprites by grid cell
+        self.cells = {}
+        # Level on grid cells and result of program on it
+        self.field = Field()
+        self.outcome = Outcome()
+        # Robot pose before current command, goes by simulation rules
+        self.walker = Outcome()
+        # Sub-step of program when robot falls, None if it does not
+        self.fall_at = None
         # Scene running
         self.launch = False
         # Program running finished
@@ -42,15 +64,46 @@ class Scene(surface.Surface):
         self.death = False
         # Current command in program
         self.current = -1
-        # Current scene time
+        # Sub-steps done in current command
         self.timing = 0
+        # Real time, that is not simulated yet
+        self.lag = 0
         # Speed up option
         self.speed_up = False
+        # Turbo option
+        self.turbo = False
+        # Robot rect on surface, when it was drawn
+        self.shown = pygame.Rect(0, 0, 0, 0)
         self.update()
 
     def update(self):
-        surface.Surface.update(self)
+        self.blit(self.get_layer(), (0, 0))
         self.robot.blit(self)
+        self.shown = self.robot.rect.copy()
+        self.touch()
+
+    def get_layer(self):
+        """
+        Bakes background and tiles into one surface, if they changed
+        :return: pygame.Surface
+        """
+        if self.layer is None:
+            self.layer = pygame.Surface(self.get_size())
+            if self.color is not None:
+                self.layer.fill(self.color)
+            self.layer.blits([(i.image, i.rect) for i in self.group], doreturn=False)
+        return self.layer
+
+    def frame(self):
+        """
+        Draws running scene. Only robot moves, so only its rects are changed
+        :return:
+        """
+        self.blit(self.get_layer(), self.shown, self.shown)
+        self.robot.blit(self)
+        self.touch(self.shown)
+        self.touch(self.robot.rect)
+        self.shown = self.robot.rect.copy()
 
     def level(self, lvl):
         """
@@ -60,18 +113,44 @@ class Scene(surface.Surface):
         """
         self.flush()
         for i in lvl.tiles:
-            self.group.add(Tile(i.type, i.place))
+            self.add_tile(Tile(i.type, i.place))
+        self.field = Field(lvl)
+        self.restart()
 
-        self.robot.direct(lvl.direction)
-        self.robot.place(lvl.placement)
+    def restart(self):
+        """
+        Puts robot back to start of level. Tiles and layer stay as they are
+        :return: ready for game scene
+        """
+        self.reset()
+        self.robot.direct(self.field.direction)
+        self.robot.place(self.field.placement)
         self.update()
 
+    def add_tile(self, sprite):
+        """
+        Adds tile sprite on scene
+        :param sprite: Tile
+        :return:
+        """
+        self.group.add(sprite)
+        self.cells.setdefault(sprite.cell(), []).append(sprite)
+        self.layer = None
+
+    def tile_at(self, point):
+        """
+        Tiles under point
+        :param point: tuple related to surface
+        :return: list of Tile
+        """
+        return self.cells.get((int(point[0] // tile.width), int(point[1] // tile.height)), [])
+
     def set_program(self, program):
         """
         :param program: list of strings - "Dirty" program
         :return:
         """
-        self.program = program
+        self.program = parse(program)
 
     def event(self, mouse, event):
         """
@@ -86,65 +165,82 @@ class Scene(surface.Surface):
             if event.type == pygame.MOUSEBUTTONUP:
                 if self.robot.collision(self.on_surface(mouse.get_pos())):
                     result.append(self.robot)
-                for i in self.group:
-                    if i.collision(self.on_surface(mouse.get_pos())):
-                        result.append(i)
+                result.extend(self.tile_at(self.on_surface(mouse.get_pos())))
                 self.echo = result
 
-    def action(self, command, tick):
-        """
-        Moving robot according to program
-        :param command: current "line" of program
-        :param tick: time passed from last call of this function
-        :return: moving effect of robot
-        """
-        if command == "die":
-            self.robot.death(tick / time)
-        elif command == "forward":
-            self.robot.move(tick / time)
-        elif command == "back":
-            self.robot.move(-tick / time)
-        elif command == "left":
-            self.robot.turn(-tick / time)
-            self.robot.update()
-        elif command == "right":
-            self.robot.turn(tick / time)
-            self.robot.update()
+    def show(self):
+        """
+        Places robot between poses before and after current command
+        :return:
+        """
+        cell = self.walker.position
+        direction = self.walker.direction
+        # Part of next sub-step, that is already passed
+        part = 0 if self.death else min(self.lag / step_time, 1)
+        if self.fall_at is not None:
+            part = max(min(part, self.fall_at - self.current * substeps - self.timing), 0)
+        percent = (self.timing + part) / substeps
+        if self.command in moves:
+            shift = steps[direction]
+            cell = (cell[0] + shift[0] * moves[self.command] * percent,
+                    cell[1] + shift[1] * moves[self.command] * percent)
+        elif self.command in turns:
+            direction += turns[self.command] * percent
+        self.robot.show(cell, direction)
 
     def state(self):
         """
-        Checks robot state while running
-        :return:
+        Checks robot state while running.
+        Simulation decides, robot only shows it
+        :return: Bool, robot just started to fall
         """
-        # Sprites on which Polo is standing
-        stand = self.robot.tile_collide(self.group)
+        # Polo falls when its center gets out of tiles
+        fall = self.fall_at is not None and self.current * substeps + self.timing >= self.fall_at
         # Means end of road, and reload
         if len(self.program) <= self.current or (self.death and not self.robot.dying()):
             """If end of program or out of tiles"""
             self.launch = False
             self.done = True
             self.current = -1
-            if stand[0]:
-                for i in stand[1]:
-                    if i.name == "finish":
-                        self.success = True
+            self.success = self.outcome.success
         # Means death (if robot out of tiles)
-        if not self.death and not stand[0]:
+        falls = not self.death and fall
+        if falls:
             self.robot.death_sound.play()
-        self.death = not stand[0]
+        self.death = self.death or fall
+        return falls
 
     def start(self):
         """
-        Setups start of scene
+        Setups start of scene, program runs from its beginning
+        :return:
+        """
+        self.clear()
+        self.launch = len(self.program) > 0
+        self.current = 0
+        self.commands = iter(self.program)
+        self.command = next(self.commands, None)
+        self.outcome = simulate(self.field, self.program)
+        self.walker = Outcome(self.field.placement, self.field.direction)
+        # Center leaves last tile in the middle of falling command
+        self.fall_at = None
+        if self.outcome.fall is not None:
+            self.fall_at = (self.outcome.steps - 1) * substeps + substeps // 2
+
+    def clear(self):
+        """
+        Clears state of run, program is not touched
         :return:
         """
         self.done = False
         self.death = False
         self.success = False
         self.speed_up = False
+        self.turbo = False
+        self.launch = False
         self.timing = 0
-        self.launch = len(self.program) > 0
-        self.current = 0 if self.current < 0 else self.current
+        self.lag = 0
+        self.current = -1
 
     def flush(self):
         """
@@ -152,36 +248,108 @@ class Scene(surface.Surface):
         :return:
         """
         surface.Surface.flush(self)
+        self.cells = {}
+        self.layer = None
+        self.reset()
+
+    def reset(self):
+        """
+        Stops program and brings robot back to life
+        :return:
+        """
         self.robot.flush()
-        self.start()
-        self.launch = False
-        self.speed_up = False
-        self.current = -1
+        self.clear()
+
+    def next_command(self):
+        """
+        Pulls next simple command from program
+        :return:
+        """
+        self.current += 1
+        self.command = next(self.commands, None)
+
+    def progress(self):
+        """
+        Progress of running program
+        :return: tuple of current command index and program length
+        """
+        return max(self.current, 0), len(self.program)
 
     def step(self, tick):
         """
-        Running of scene
+        Running of scene. Simulation goes by fixed sub-steps, whatever frame time is,
+        robot is shown between them
         :param tick: time from lst call
         :return: calls robot movement
         """
+        if self.turbo and not self.death:
+            self.jump(turbo_commands)
+        if self.speed_up and not self.death:
+            tick *= speed_up
+        self.lag += tick
+        while self.lag >= step_time and self.launch:
+            self.lag -= step_time
+            self.advance()
+            # Check if we can move more, robot is shown where it falls
+            if self.state():
+                self.show()
+        if not self.death:
+            self.show()
+
+    def jump(self, amount):
+        """
+        Does whole commands at once, without sub-steps. Falling command is left to sub-steps
+        :param amount: max amount of commands
+        :return:
+        """
+        for i in range(amount):
+            if self.current >= len(self.program):
+                break
+            if self.fall_at is not None and (self.current + 1) * substeps > self.fall_at:
+                break
+            self.timing = 0
+            self.walker.run(self.command, self.field)
+            self.next_command()
+        self.state()
+
+    def skip(self):
+        """
+        Skips to result of program, only end of it is shown
+        :return:
+        """
+        if not self.launch or self.death:
+            return
+        self.lag = 0
+        if self.outcome.fall is None:
+            self.walker = Outcome(self.outcome.position, self.outcome.direction)
+            self.current = len(self.program)
+            self.command = None
+            self.timing = 0
+        elif self.outcome.steps > 0:
+            # Robot stops in the middle of falling command
+            shift = steps[self.outcome.direction]
+            move = moves[self.outcome.command]
+            self.walker = Outcome((self.outcome.position[0] - shift[0] * move,
+                                   self.outcome.position[1] - shift[1] * move), self.outcome.direction)
+            self.current = self.outcome.steps - 1
+            self.command = self.outcome.command
+            self.timing = self.fall_at - self.current * substeps
+        self.state()
+        self.show()
+
+    def advance(self):
+        """
+        One sub-step of simulation
+        :return:
+        """
         # If death called from state()
         if self.death:
             # Perform die action
-            self.action("die", tick * speed_up * speed_up)
-            # Call end of program
+            self.robot.death(speed_up * speed_up * step_time / time)
         else:
-            if self.speed_up:
-                tick *= speed_up
-            self.timing += tick
-            if self.timing >= time:
-                '''If tick get into 2 different commands in program'''
-                self.timing %= time
-                self.action(self.program[self.current], tick - self.timing)
-                self.current += 1
-                if self.current < len(self.program):
-                    self.action(self.program[self.current], self.timing)
-            else:
-                self.action(self.program[self.current], tick)
-
-        # Check if we can move more
-        self.state()
+            self.timing += 1
+            if self.timing >= substeps and self.current < len(self.program):
+                '''Next command in program'''
+                self.timing = 0
+                self.walker.run(self.command, self.field)
+                self.next_command()
@@ -23,12 +23,51 @@ class Surface(pygame.Surface):
         self.mouse = None
         self.hover = None
         self.echo = None
+        # Changed part of surface, not shown yet
+        self.dirty = None
+        # Model changed, surface has to be redrawn
+        self.invalid = False
         self.update()
 
     def update(self):
         if self.color is not None:
             self.fill(self.color)
-        self.group.draw(self)
+        self.blits([(i.image, i.rect) for i in self.group], doreturn=False)
+        self.touch()
+
+    def invalidate(self):
+        """
+        Marks surface to be redrawn on next refresh
+        :return:
+        """
+        self.invalid = True
+
+    def refresh(self):
+        """
+        Redraws surface, if its model changed
+        :return:
+        """
+        if self.invalid:
+            self.invalid = False
+            self.update()
+
+    def touch(self, rect=None):
+        """
+        Marks part of surface as changed
+        :param rect: rect related to surface, whole surface if None
+        :return:
+        """
+        rect = self.get_rect() if rect is None else pygame.Rect(rect)
+        self.dirty = rect if self.dirty is None else self.dirty.union(rect)
+
+    def get_dirty(self):
+        """
+        Gets changed part of surface and forgets it
+        :return: rect related to surface, None if nothing changed
+        """
+        result = self.dirty.clip(self.get_rect()) if self.dirty is not None else None
+        self.dirty = None
+        return result
 
     def is_in(self, point):
         """
@@ -66,6 +105,7 @@ class Surface(pygame.Surface):
         :param mouse: pygame.mouse
         :return: list of clicked sprites into self.echo
         """
+        was_hover = self.hover
         self.echo = None
         self.hover = None
         if self.is_in(mouse.get_pos()):
@@ -74,6 +114,9 @@ class Surface(pygame.Surface):
             if event.type == pygame.MOUSEBUTTONUP or self.mouse.get_pressed()[2]:
                 self.echo = self.hover
             self.make()
+        # Redraw only if something was clicked or hover target changed
+        if self.echo is not None or self.hover != was_hover:
+            self.invalidate()
 
     def make(self):
         pass
@@ -100,7 +143,6 @@ class Surface(pygame.Surface):
         Gets echo
         :return: echo any
         """
-        self.update()
         return self.echo
 
     def echo_out(self):
@@ -4,6 +4,8 @@
 # 19.01.2017
 from Modules.sprite import Sprite
 
+height = 50
+width = 50
 location = "Source/Tiles/"
 expansion = ".png"
 
@@ -18,3 +20,9 @@ class Tile(Sprite):
         Sprite.__init__(self, name, placement)
         image_path = image_path if image_path is not None else location + name + expansion
         self.load_image(image_path)
+
+    def cell(self):
+        """
+        :return: tuple of (x, y) tile under sprite
+        """
+        return self.rect.x // width, self.rect.y // height
@@ -0,0 +1,44 @@
+# By Zhufyak V.V
+# zhufyakvv@gmail.com
+# github.com/zhufyakvv
+# Converts pickled levels to binary level files. Run from game folder: python convert.py [level names]
+import pickle
+import sys
+
+import level
+
+
+class LevelUnpickler(pickle.Unpickler):
+    """
+    Unpickles only level data, nothing else can be called from file
+    """
+
+    def find_class(self, module, name):
+        if module == "level" and name == "RawTile":
+            return level.RawTile
+        raise pickle.UnpicklingError("Level file can't have " + module + "." + name)
+
+
+def convert(name):
+    """
+    Rewrites pickled level as binary level file
+    :param name: level name
+    :return: Bool, level was converted, False if it is binary already
+    """
+    path = level.location + name + level.expansion
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data.startswith(level.magic):
+        return False
+    with open(path, 'rb') as f:
+        old = LevelUnpickler(f).load()
+    lvl = level.Level(name)
+    lvl.__dict__.update(old)
+    with open(path, 'wb') as f:
+        f.write(lvl.pack())
+    return True
+
+
+if __name__ == "__main__":
+    for i in sys.argv[1:] if len(sys.argv) > 1 else sorted(level.get_levels()):
+        print(i + (" converted" if convert(i) else " is binary already"))
@@ -13,6 +13,7 @@ from Modules.scene import Scene
 from level import Level, Voice, save_current, load_current
 
 FPS = variables.FPS
+idle_wait = variables.idle_wait
 window_title = variables.window_title
 screen_resolution = variables.screen_resolution
 screen_mode = variables.screen_mode
@@ -56,6 +57,8 @@ class Engine:
         self.scene = Scene()
         self.menu = Menu()
         self.message = Message()
+        # Panels on top, when display was updated last time
+        self.shown = ()
         self.voice = Voice()
 
     def update_all(self):
@@ -63,6 +66,8 @@ class Engine:
         Updating all screen.
         :return:
         """
+        for i in (self.controls, self.program, self.scene, self.menu, self.message):
+            i.refresh()
         self.display.blit(self.controls, self.controls.rect)
         self.display.blit(self.program, self.program.rect)
         self.display.blit(self.scene, self.scene.rect)
@@ -72,28 +77,41 @@ class Engine:
         elif self.pause:
             self.display.blit(self.menu, self.menu.rect)
         pygame.display.flip()
+        self.shown = self.on_top()
+        # Everything is shown
+        for i in (self.controls, self.program, self.scene, self.menu, self.message):
+            i.get_dirty()
 
     def update(self):
         """
-        Updating parts of scene
+        Updating changed parts of panels on top
         :return:
         """
-        mouse = pygame.mouse.get_pos()
+        panels = self.on_top()
+        rects = []
+        for i in panels:
+            # Panel was under overlay or overlay was closed, whole of it is shown again
+            if i not in self.shown:
+                i.touch()
+            i.refresh()
+            dirty = i.get_dirty()
+            if dirty is not None:
+                rect = dirty.move(i.rect.x, i.rect.y)
+                self.display.blit(i, rect, dirty)
+                rects.append(rect)
+        self.shown = panels
+        if len(rects) > 0:
+            pygame.display.update(rects)
+
+    def on_top(self):
+        """
+        :return: tuple of panels, that are seen now
+        """
         if self.talk:
-            self.display.blit(self.message, self.message.rect)
-            pygame.display.update(self.message.rect)
+            return self.message,
         elif self.pause:
-            self.display.blit(self.menu, self.menu.rect)
-            pygame.display.update(self.menu.rect)
-        else:
-            if self.program.is_in(mouse) or self.controls.is_in(mouse):
-                self.display.blit(self.controls, self.controls.rect)
-                self.display.blit(self.program, self.program.rect)
-                pygame.display.update(self.program.rect)
-                pygame.display.update(self.controls.rect)
-            if self.scene.is_in(mouse) or self.scene.launch:
-                self.display.blit(self.scene, self.scene.rect)
-                pygame.display.update(self.scene.rect)
+            return self.menu,
+        return self.controls, self.program, self.scene
 
     def get_level(self):
         """
@@ -179,14 +197,52 @@ class Engine:
 
     def reload(self):
         """
-        Reloads level(scene)
+        Reloads level(scene), only robot goes back to start
         :return:
         """
-        self.scene.level(self.level)
-        self.update_all()
+        self.scene.restart()
 
-    def event(self):
-        for event in pygame.event.get():
+    def animating(self):
+        """
+        :return: Bool, something moves on screen and needs every frame
+        """
+        return self.scene.launch
+
+    def wait(self):
+        """
+        Gets events. When nothing moves, sleeps until event comes, instead of spinning
+        :return: list of pygame.event.Event
+        """
+        if self.animating():
+            return pygame.event.get()
+        first = pygame.event.wait(idle_wait)
+        events = [first] if first.type != pygame.NOEVENT else []
+        return events + pygame.event.get()
+
+    @staticmethod
+    def coalesce(events):
+        """
+        Leaves only latest mouse motion, modules read mouse position by themselves.
+        Other events stay in order
+        :param events: list of pygame.event.Event
+        :return: list of pygame.event.Event
+        """
+        last = None
+        for i in range(len(events)):
+            if events[i].type == pygame.MOUSEMOTION:
+                last = i
+        return [events[i] for i in range(len(events)) if events[i].type != pygame.MOUSEMOTION or i == last]
+
+    def event(self, events=None):
+        """
+        Handles events. Echos of clicks and keys are invoked one by one,
+        mouse motion is invoked once
+        :param events: list of events, all waiting events if None
+        :return:
+        """
+        if events is None:
+            events = pygame.event.get()
+        for event in self.coalesce(events):
             if event.type == pygame.QUIT:
                 self.exit()
             if event.type == pygame.KEYDOWN:
@@ -196,6 +252,7 @@ class Engine:
                 if event.key == pygame.K_SPACE:
                     if self.talk:
                         self.message.page += 1
+                        self.message.invalidate()
                         if self.message.page >= len(self.message.text):
                             self.talk = False
                             self.message.page = 0
@@ -206,6 +263,10 @@ class Engine:
                         self.setup_scene()
                     elif self.scene.launch:
                         self.scene.speed_up = True
+                if event.key == pygame.K_t and self.scene.launch:
+                    self.scene.turbo = not self.scene.turbo
+                if event.key == pygame.K_RETURN and self.scene.launch:
+                    self.scene.skip()
 
             if self.talk:
                 self.message.event(pygame.mouse, event)
@@ -221,8 +282,21 @@ class Engine:
                 if self.scene.launch and pygame.mouse.get_pressed()[0]:
                     # Speed up scene
                     self.scene.speed_up = True
+            # Next event clears echos, so clicks are invoked at once
+            if self.echoed():
+                self.invoker()
+        if len(events) > 0:
             self.invoker()
 
+    def echoed(self):
+        """
+        :return: Bool, some module has echo to invoke
+        """
+        for i in (self.message, self.controls, self.program, self.scene, self.menu):
+            if i.get_echo() is not None:
+                return True
+        return False
+
     def invoker(self):
         """
         Invokes module calls
@@ -325,7 +399,7 @@ class Engine:
         setups
         :return:
         """
-        self.scene.set_program(self.program.get_program())
+        self.scene.set_program(self.program.get_commands())
         self.scene.start()
         self.clock.tick()
 
@@ -363,7 +437,7 @@ class Engine:
             """Scene"""
             if self.scene.launch:
                 self.scene.step(self.clock.tick(FPS))
-                self.scene.update()
+                self.scene.frame()
             """Scene result"""
             if self.scene.done and not self.scene.success:
                 self.reload()
@@ -378,7 +452,8 @@ class Engine:
                 # self.pause = True
 
             """Events"""
-            self.event()
+            # Frame rate is capped by scene, idle loop waits for events
+            self.event(self.wait())
             """Update"""
             self.update()
 
@@ -0,0 +1,113 @@
+# By Zhufyak V.V
+# zhufyakvv@gmail.com
+# github.com/zhufyakvv
+# Solves all levels in parallel. Run from game folder: python farm.py [processes]
+import csv
+import hashlib
+import json
+import multiprocessing
+import sys
+import time
+
+import level
+from Libraries.solve import solve
+
+cache_file = "solved.json"
+results_file = "solved.csv"
+columns = ("level", "solvable", "limited", "length", "states", "time", "program")
+
+
+def level_hash(name):
+    """
+    Hash of level file, same levels share solution
+    :param name: level name
+    :return: hex string
+    """
+    with open(level.location + name + level.expansion, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def work(task):
+    """
+    Solves one level, runs in worker process
+    :param task: tuple of level name and hash
+    :return: tuple of hash and result row
+    """
+    name, digest = task
+    lvl = level.Level(name)
+    lvl.load()
+    start = time.time()
+    solution = solve(lvl)
+    return digest, {
+        "solvable": solution.program is not None,
+        # Not solved in state limit, solvable is unknown then
+        "limited": solution.limited,
+        "length": len(solution),
+        "states": solution.expanded,
+        "time": round(time.time() - start, 3),
+        "program": " ".join(solution.program) if solution.program is not None else ""
+    }
+
+
+def load_cache():
+    """
+    :return: dict of already solved level hashes
+    """
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return {k: v for k, v in cache.items() if not v.get("limited", False)}
+
+
+def save_cache(cache):
+    """
+    Saves solved levels, levels stopped at state limit are not solved and are not saved
+    :param cache: dict of level hashes and result rows
+    :return:
+    """
+    solved = {k: v for k, v in cache.items() if not v.get("limited", False)}
+    with open(cache_file, 'w') as f:
+        json.dump(solved, f, indent=1, sort_keys=True)
+
+
+def farm(processes=None):
+    """
+    Solves every level, that was not solved yet, in process pool
+    :param processes: amount of worker processes, all cores if None
+    :return: list of result rows
+    """
+    cache = load_cache()
+    levels = sorted(level.get_levels())
+    hashes = {name: level_hash(name) for name in levels}
+    # Same levels are solved once
+    tasks = {}
+    for name in levels:
+        if hashes[name] not in cache and hashes[name] not in tasks:
+            tasks[hashes[name]] = name
+
+    if len(tasks) > 0:
+        with multiprocessing.Pool(processes) as pool:
+            for digest, row in pool.imap_unordered(work, [(name, digest) for digest, name in tasks.items()]):
+                cache[digest] = row
+                save_cache(cache)
+                action = "Gave up on " if row["limited"] else "Solved "
+                print(action + tasks[digest] + " in " + str(row["time"]) + "s")
+
+    rows = []
+    for name in levels:
+        row = dict(cache[hashes[name]])
+        row["level"] = name
+        rows.append(row)
+    with open(results_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    result = farm(int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    for i in result:
+        print("\t".join(str(i[j]) for j in columns))
@@ -2,11 +2,11 @@
 # zhufyakvv@gmail.com
 # github.com/zhufyakvv
 # 19.01.2017
+import array
 import io
 import os
-import pickle
-
-import variables
+import struct
+import sys
 
 tile = (50, 50)
 image_expansion = ".png"
@@ -16,6 +16,20 @@ tile_location = "Source/Tiles/"
 tile_default = "default"
 tile_expansion = ".png"
 
+# Level file: header, name, command budgets, tile types, tile cells, tile type ids.
+# Little endian, strings are utf-8 with length before them
+magic = b"POLO"
+version = 1
+header = struct.Struct("<4sH")
+# Robot x, y, direction, amounts of commands, tile types, tiles, length of name
+body = struct.Struct("<hhBBHIH")
+# Command amount
+budget = struct.Struct("<H")
+max_budget = 2 ** (8 * budget.size) - 1
+string_length = struct.Struct("<B")
+# Cell x, y and type id of one tile
+tile_size = struct.calcsize("<hhH")
+
 
 # TODO Add Messages
 # TODO Some refactor thing
@@ -24,7 +38,7 @@ tile_expansion = ".png"
 class RawTile:
     """
     Raw tile class
-    Because Tile that extends pygame.sprite cant be pickled
+    Because Tile that extends pygame.sprite cant be saved
     """
 
     def __init__(self, kind, place):
@@ -32,6 +46,12 @@ class RawTile:
         self.location = tile_location + kind + tile_expansion
         self.place = place
 
+    def cell(self):
+        """
+        :return: tuple of (x, y) tile
+        """
+        return self.place[0] // tile[0], self.place[1] // tile[1]
+
 
 class Level:
     def __init__(self, name):
@@ -39,6 +59,8 @@ class Level:
         self.name = name
         # List of tiles
         self.tiles = []
+        # Tiles by grid cell
+        self.cells = {}
         # Available commands and amount
         self.moves = {'right': 0, 'left': 0, 'forward': 0, 'back': 0, 'lo': 0, 'op': 0}
         # Robot placement
@@ -50,20 +72,118 @@ class Level:
         Loads level from file
         :return:
         """
-        f = open(location + self.name + expansion, 'rb')
-        tmp_dict = pickle.load(f)
-        f.close()
-
-        self.__dict__.update(tmp_dict)
+        with open(location + self.name + expansion, 'rb') as f:
+            self.unpack(f.read())
+        self.index()
 
     def save(self):
         """
         Saves level
         :return:
         """
-        f = open(location + self.name + expansion, 'wb')
-        pickle.dump(self.__dict__, f, 2)
-        f.close()
+        with open(location + self.name + expansion, 'wb') as f:
+            f.write(self.pack())
+
+    def pack(self):
+        """
+        :return: bytes of level file
+        """
+        kinds = []
+        for i in self.tiles:
+            if i.type not in kinds:
+                kinds.append(i.type)
+        name = self.name.encode("utf-8")
+        try:
+            result = [header.pack(magic, version),
+                      body.pack(self.placement[0], self.placement[1], self.direction, len(self.moves), len(kinds),
+                                len(self.tiles), len(name)),
+                      name]
+            for command, amount in self.moves.items():
+                result.append(pack_string(command))
+                result.append(budget.pack(amount))
+            for i in kinds:
+                result.append(pack_string(i))
+            cells = array.array("h")
+            types = array.array("H")
+            for i in self.tiles:
+                cells.extend(i.cell())
+                types.append(kinds.index(i.type))
+        except (struct.error, OverflowError) as error:
+            raise ValueError("Level can't be saved: " + self.name + ", " + str(error))
+        if sys.byteorder != "little":
+            cells.byteswap()
+            types.byteswap()
+        result.append(cells.tobytes())
+        result.append(types.tobytes())
+        return b"".join(result)
+
+    def unpack(self, data):
+        """
+        Reads level from bytes of level file
+        :param data: bytes
+        :return:
+        """
+        broken = "Broken level file: " + self.name
+        if len(data) < header.size + body.size:
+            raise ValueError(broken)
+        kind, current = header.unpack_from(data, 0)
+        if kind != magic or current != version:
+            raise ValueError("Not a level file of version " + str(version) + ": " + self.name)
+        offset = header.size
+        x, y, direction, commands, kinds, tiles, length = body.unpack_from(data, offset)
+        offset += body.size
+        try:
+            name = data[offset:offset + length].decode("utf-8")
+            offset += length
+            moves = {}
+            for i in range(commands):
+                command, offset = unpack_string(data, offset)
+                moves[command] = budget.unpack_from(data, offset)[0]
+                offset += budget.size
+            names = []
+            for i in range(kinds):
+                kind, offset = unpack_string(data, offset)
+                names.append(kind)
+        except (struct.error, UnicodeDecodeError):
+            raise ValueError(broken)
+        # Tiles are the rest of file
+        if len(data) != offset + tiles * tile_size:
+            raise ValueError(broken)
+
+        cells = array.array("h")
+        cells.frombytes(data[offset:offset + 2 * tiles * cells.itemsize])
+        offset += 2 * tiles * cells.itemsize
+        types = array.array("H")
+        types.frombytes(data[offset:])
+        if sys.byteorder != "little":
+            cells.byteswap()
+            types.byteswap()
+        if tiles > 0 and max(types) >= kinds:
+            raise ValueError(broken)
+
+        self.name = name
+        self.placement = (x, y)
+        self.direction = direction
+        self.moves = moves
+        self.tiles = [RawTile(names[kind], (x * tile[0], y * tile[1]))
+                      for x, y, kind in zip(cells[0::2], cells[1::2], types)]
+
+    def index(self):
+        """
+        Builds tiles by cell index
+        :return:
+        """
+        self.cells = {}
+        for i in self.tiles:
+            self.cells.setdefault(i.cell(), []).append(i)
+
+    def tile_at(self, place):
+        """
+        Tiles at some place
+        :param place: tuple of (x, y) tile
+        :return: list of RawTile
+        """
+        return self.cells.get(tuple(place), [])
 
     def delete_tile(self, place):
         """
@@ -71,10 +191,9 @@ class Level:
         :param place: tuple
         :return: 
         """
-        place = (place[0] * tile[0], place[1] * tile[1])
-        for i in self.tiles:
-            if i.place == place:
-                self.tiles.pop(self.tiles.index(i))
+        if self.cells.pop(tuple(place), None) is not None:
+            place = (place[0] * tile[0], place[1] * tile[1])
+            self.tiles = [i for i in self.tiles if i.place != place]
 
     def add_tile(self, place, name=tile_default):
         """
@@ -84,16 +203,18 @@ class Level:
         :return:
         """
         if os.path.exists(tile_location + name + tile_expansion):
-            self.tiles.append(RawTile(name, (place[0] * tile[0], place[1] * tile[1])))
+            raw = RawTile(name, (place[0] * tile[0], place[1] * tile[1]))
+            self.tiles.append(raw)
+            self.cells.setdefault(raw.cell(), []).append(raw)
 
     def change_command(self, name, amount):
         """
         Changes some command available amount
         :param name: name of command
-        :param amount: new amount
+        :param amount: new amount, clamped to what level file can keep
         :return:
         """
-        self.moves[name] = int(amount)
+        self.moves[name] = max(0, min(int(amount), max_budget))
 
     def robot_place(self, t):
         """
@@ -163,13 +284,44 @@ class Voice:
             f.close()
 
 
+def get_levels():
+    """
+    Level names, without pygame
+    :return: list of strings
+    """
+    return [f for f in os.listdir(location) if os.path.isfile(os.path.join(location, f))]
+
+
+def pack_string(text):
+    """
+    :param text: string
+    :return: bytes of length and utf-8 text
+    """
+    text = text.encode("utf-8")
+    return string_length.pack(len(text)) + text
+
+
+def unpack_string(data, offset):
+    """
+    :param data: bytes
+    :param offset: where string starts
+    :return: string and offset after it
+    """
+    length = string_length.unpack_from(data, offset)[0]
+    offset += string_length.size
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
 def save_current(level, lang):
+    # Level has to stay without pygame, variables starts it
+    import variables
     f = open(variables.user_config_file, "w")
     f.write(str(int(level)) + '\n' + str(int(lang)))
     f.close()
 
 
 def load_current():
+    import variables
     f = open(variables.user_config_file, "r")
     text = f.read().split()
     level = int(text[0])
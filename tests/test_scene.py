@@ -0,0 +1,59 @@
+# By Zhufyak V.V
+# zhufyakvv@gmail.com
+# github.com/zhufyakvv
+# Run from game folder: python -m unittest discover tests
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((800, 600))
+
+from Modules.scene import Scene
+from level import Level
+
+
+class SceneTest(unittest.TestCase):
+    def run_scene(self, scene, program, tick=17, limit=10000):
+        """
+        Runs program on scene till the end
+        :return: amount of frames
+        """
+        scene.set_program(program)
+        scene.start()
+        frames = 0
+        while scene.launch and frames < limit:
+            scene.step(tick)
+            frames += 1
+        return frames
+
+    def test_program_after_empty_one(self):
+        lvl = Level("2")
+        lvl.load()
+        scene = Scene()
+        scene.level(lvl)
+        self.run_scene(scene, [])
+        self.assertFalse(scene.launch)
+        self.run_scene(scene, ["forward", "right", "forward", "forward", "right", "forward"])
+        self.assertTrue(scene.done)
+        self.assertTrue(scene.success)
+        self.assertEqual(scene.walker.position, (6, 6))
+
+    def test_retry_keeps_result(self):
+        lvl = Level("2")
+        lvl.load()
+        scene = Scene()
+        scene.level(lvl)
+        for i in range(2):
+            self.run_scene(scene, ["forward", "forward"])
+            self.assertTrue(scene.done)
+            self.assertFalse(scene.success)
+            scene.restart()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,16 +4,19 @@ import pygame
 
 """Main setup"""
 FPS = 60
+# Longest sleep in milliseconds of idle main loop, waiting for events
+idle_wait = 250
 window_title = 'Polo'
 screen_resolution = (800, 600)
 screen_mode = pygame.FULLSCREEN
 level_path = r"/Levels/"
+# Pre-rotated angles in every quarter turn of sprites
+rotation_steps = 8
 
 """Fonts and Language"""
 language = 0
 pygame.font.init()
 size = 16
-message_line_length = 70
 font_location = "Source/Fonts/"
 orson_location = font_location + "SFOrson/"
 silver_location = font_location + "SilverAge/"